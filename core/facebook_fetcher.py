@@ -191,9 +191,9 @@ class FacebookFetcher:
         self.c_user = config.cookie_c_user
 
     def fetch_last_active_times(self):
-        """ Returns an OrderedDict, mapping user_id to list of epoch times.
+        """ Returns a dict, mapping user_id to list of epoch times.
 
-        Does not throw, returns an empty OrderedDict if an error occurs.
+        Does not throw, returns an empty dict if an error occurs.
         """
 
         try:
@@ -207,7 +207,7 @@ class FacebookFetcher:
             logging.error(
                 "Error while downloading page '{0}', "
                 "got exception: '{1}'".format(self.buddy_feed_url, e))
-            return OrderedDict()
+            return {}
 
     def fetch_content_recursively(self, initial_url, parsing_function):
 
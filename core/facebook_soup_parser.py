@@ -1,19 +1,133 @@
 from core import common
 from core import model
 
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
 from collections import namedtuple
-from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import functools
 import json
 import logging
+import operator
+import os
 import re
+import sys
+
+try:
+    # orjson decodes the buddy list a lot faster, but is optional
+    import orjson as _json
+except ImportError:
+    _json = json
 
 
 GenericResult = namedtuple('GenericResult', ['content', 'see_more_links'])
 TimelineResult = namedtuple('TimelineResult', ['articles', 'show_more_link'])
 ReactionResult = namedtuple('ReactionResult', ['likers', 'see_more_link'])
 
+# Patterns used on every parsed page, compiled once at import time
+_RE_TIMELINE_HREF = re.compile(r"^/.*\?v=timeline.lst=\d+%3A\d+%3A")
+_RE_FRIEND_HREF = re.compile(r"^/.*fref=fr_tab")
+_RE_LIKE_ID = re.compile(r"like_(\d+)")
+_RE_HREF_SLASH = re.compile(r"^/.*")
+# Tracking parameters following the username in the links of a post
+_RE_ID_TRIM = re.compile(r"&refid=18|\?refid=18|\?lst|&fref|&lst")
+_RE_MUTUAL_FRIEND_HREF = re.compile(r"^/.*\?fref=fr_tab")
+_RE_LIKES_CATEGORY = re.compile(r"^h[34]$")
+_RE_UNAVAILABLE = re.compile("It may be temporarily unavailable")
+_RE_REACTION = re.compile(r"reaction")
+_RE_COMMENT_COUNT = re.compile(r"\d+ Comment")
+# Links of reaction pages which do not point to a user
+_RE_INVALID_REACTION_LINK = re.compile(
+    r"add_friend\.php|ufi/reaction|home\.php\?")
+
+# Fields of the about page, in the order they are reported, mapped to the
+# keys used in the result. Keys are built and interned once so that every
+# parsed page shares them.
+_ABOUT_TAGS = {
+    tag: sys.intern(tag.replace(" ", "_").lower()) for tag in (
+        'AIM', 'Address', 'BBM', 'Birth Name', 'Birthday',
+        'Facebook', 'Foursquare', 'Gadu-Gadu', 'Gender', 'ICQ',
+        'Instagram', 'Interested in', 'Languages', 'LinkedIn',
+        'Maiden Name', 'Mobile', 'Nickname', 'Political Views',
+        'Religious views', 'Skype', 'Snapchat', 'Twitter', 'VK',
+        'Websites', 'Windows Live Messenger', 'Year of birth')}
+_INSTITUTION_TAGS = ("work", "education")
+_IDENTIFIED_DIV_IDS = frozenset(_INSTITUTION_TAGS + ("relationship",))
+_RE_RELATIONSHIP = re.compile("|".join(re.escape(choice) for choice in (
+    'In a relationship', 'Engaged', 'Married',
+    'In a civil partnership', 'In a domestic partnership',
+    'In an open relationship', 'It\'s complicated', 'Separated',
+    'Divorced', 'Widowed', 'Single')))
+
+_YEARS_CONTAINER_IDS = ["tlFeed", "timelineBody", "m_group_stories_container"]
+_TIMELINE_CONTAINER_IDS = \
+    _YEARS_CONTAINER_IDS + ["structured_composer_async_container"]
+_SHOW_MORE_TEXTS = ["Show more", "See more posts"]
+
+# Only the parts of the pages that are read are turned into a tree
+_OBJECTS_STRAINER = SoupStrainer(id="objects_container")
+_TIMELINE_STRAINER = SoupStrainer(id=_TIMELINE_CONTAINER_IDS)
+_ERROR_STRAINER = SoupStrainer(["input", "span"])
+_LINKS_STRAINER = SoupStrainer("a")
+
+# Strings making up the text of a tag, as used by Tag.stripped_strings
+_TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+@functools.lru_cache(maxsize=8)
+def _make_soup(content, parse_only=None):
+    """Parse content, reusing the tree built by a previous call.
+
+    A timeline page is parsed twice in a row, for its year links and
+    then for its articles, and both calls use _TIMELINE_STRAINER. Trees
+    are cached per (content, parse_only) pair, so only calls with the
+    same strainer share one. The soups returned are shared and must not
+    be modified.
+
+    content is either a str or the raw bytes of the response, in which
+    case lxml detects the encoding of the page itself.
+
+    parse_only is an optional SoupStrainer restricting the tree built to
+    the elements it matches.
+
+    >>> _make_soup("<p>Some text</p>") is _make_soup("<p>Some text</p>")
+    True
+    >>> _make_soup('<p>Not kept</p><div id="objects_container">Kept</div>',
+    ...     _OBJECTS_STRAINER)
+    <div id="objects_container">Kept</div>
+    >>> _make_soup('<p>Caf\u00e9</p>'.encode()).p.text
+    'Caf\u00e9'
+    """
+    return BeautifulSoup(content, "lxml", parse_only=parse_only)
+
+
+def _contains(content, markers):
+    """Return whether any of the markers appears in the raw content.
+
+    The content can be either str or the undecoded bytes of the page.
+
+    >>> _contains('<div id="tlFeed">', ["timelineBody", "tlFeed"])
+    True
+    >>> _contains(b'<div id="tlFeed">', ["timelineBody", "tlFeed"])
+    True
+    >>> _contains(b'<div id="other">', ["timelineBody", "tlFeed"])
+    False
+    """
+    if isinstance(content, bytes):
+        return any(marker.encode() in content for marker in markers)
+    return any(marker in content for marker in markers)
+
+
+def _format_timestamp(timestamp):
+    """Format an epoch timestamp as local time, e.g. "2017-07-14 04:40:01".
+
+    Fractions of seconds are dropped.
+
+    >>> _format_timestamp(1500000001.5) == _format_timestamp(1500000001)
+    True
+    """
+    return str(datetime.fromtimestamp(int(timestamp)))
+
 
 def detect_error_type(content):
     """
@@ -27,13 +141,27 @@ def detect_error_type(content):
     'Page temporarily unavailable / broken / expired link'
     >>> detect_error_type('<html></html>')
     'Failed to parse page'
+    >>> detect_error_type('')
+    'Failed to parse page'
+    >>> detect_error_type(b'<input name="login">Login requested')
+    'Cookie expired or is invalid, login requested'
+    >>> detect_error_type('<a href="/login.php">Log in</a>')
+    'Failed to parse page'
     """
-    soup = BeautifulSoup(content, "lxml")
+    if not content:
+        return "Failed to parse page"
+
+    # Most failures are neither, which a plain substring search tells
+    # without building a tree
+    if not _contains(content, ["login", "It may be temporarily unavailable"]):
+        return "Failed to parse page"
+
+    soup = _make_soup(content, _ERROR_STRAINER)
 
     if soup.find("input", attrs={"name": "login"}):
         return "Cookie expired or is invalid, login requested"
     elif soup.find_all(
-            "span", string=re.compile("It may be temporarily unavailable")):
+            "span", string=_RE_UNAVAILABLE):
         return "Page temporarily unavailable / broken / expired link"
     else:
         return "Failed to parse page"
@@ -41,7 +169,31 @@ def detect_error_type(content):
 
 class FacebookSoupParser:
 
-    def parse_buddy_list(self, raw_json):
+    @classmethod
+    def parse_many(cls, method_name, contents, workers=None):
+        """Call the parsing method named method_name on every content.
+
+        Parsing is CPU bound, so pages are spread over a pool of processes
+        (one per CPU unless workers is given). Results are returned in the
+        same order as contents.
+
+        >>> FacebookSoupParser().parse_many("parse_timeline_years_links", [
+        ...     '<div id="tlFeed"><a href="link1">2010</a></div>',
+        ...     '<div id="tlFeed"><a href="link2">2009</a></div>'])
+        [['link1'], ['link2']]
+        """
+        contents = list(contents)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # A page takes far longer to parse than to send to a worker, so
+        # keep chunks small enough for every worker to get some pages
+        chunksize = max(1, len(contents) // (4 * workers))
+        with ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(
+                getattr(cls, method_name), contents, chunksize=chunksize))
+
+    @staticmethod
+    def parse_buddy_list(raw_json):
         """
         >>> FacebookSoupParser().parse_buddy_list(
         ... 'for (;;); {"ms": [{"type": "chatproxy-presence", '
@@ -51,62 +203,74 @@ class FacebookSoupParser:
         ... '"333": {"lat": -1}}}, {"type": "buddylist_overlay",'
         ...  '"overlay": {"333": {"la": 1500000003, "a": 0, "vc": 0, "s":'
         ... '"push"}}}], "t": "msg", "u": 123, "seq": 3}')
-        OrderedDict([('111', {'times': ['2017-07-14 04:40:01']}), \
-('222', {'times': ['2017-07-14 04:40:02']}), ('333', {'times': []})])
+        {'111': {'times': ['2017-07-14 04:40:01']}, \
+'222': {'times': ['2017-07-14 04:40:02']}, '333': {'times': []}}
         >>> FacebookSoupParser().parse_buddy_list("")
-        OrderedDict()
+        {}
         >>> FacebookSoupParser().parse_buddy_list(
         ... '{ "overlay": { "111": { '
         ... '"a": 0, "c": 74, "la": 1500000003, "s": "push", "vc": 74 }}, '
         ... '"type": "buddylist_overlay"}')
-        OrderedDict()
+        {}
         >>> FacebookSoupParser().parse_buddy_list(
         ... '{ "seq": 1, "t": "fullReload" }')
-        OrderedDict()
+        {}
         """
-        valid_raw_json = raw_json.replace("for (;;); ", "")
+        if not raw_json:
+            logging.error("Failed to decode JSON: got empty content")
+            return {}
+
+        # Facebook prepends an infinite loop to prevent JSON hijacking
+        valid_raw_json = raw_json
+        if raw_json.startswith("for (;;); "):
+            valid_raw_json = raw_json[len("for (;;); "):]
         decoded_json = ""
         try:
-            decoded_json = json.loads(valid_raw_json)
+            decoded_json = _json.loads(valid_raw_json)
         except Exception as e:
             logging.error(
                 "Failed to decode JSON: '{0}', got exception:"
                 " '{1}'".format(valid_raw_json, e))
-            return OrderedDict()
+            return {}
 
-        logging.debug("Got json: '{0}'".format(common.prettify(decoded_json)))
+        # Pretty printing the payload is costly, only do it if it is logged
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logging.debug("Got json: '{0}'".format(
+                common.prettify(decoded_json)))
         if "ms" not in decoded_json:
             logging.error("Invalid json returned - not found 'ms'")
-            logging.debug("Got instead: {0}".format(
-                common.prettify(decoded_json)))
-            return OrderedDict()
-
-        flattened_json = {}
-        for item in decoded_json["ms"]:
-            flattened_json.update(item)
-        if "buddyList" not in flattened_json:
+            if debug_enabled:
+                logging.debug("Got instead: {0}".format(
+                    common.prettify(decoded_json)))
+            return {}
+
+        # When several messages hold a buddy list, the last one is used
+        buddy_list = None
+        for item in reversed(decoded_json["ms"]):
+            if "buddyList" in item:
+                buddy_list = item["buddyList"]
+                break
+        if buddy_list is None:
             logging.error("Invalid json returned - not found 'buddyList'")
-            logging.debug("Got instead: {0}".format(
-                common.prettify(flattened_json)))
-            return OrderedDict()
-
-        buddy_list = flattened_json["buddyList"]
-        flattened_buddy_list = {}
-        for user in buddy_list:
-            if "lat" in buddy_list[user]:
-                times = []
-                lat_found = buddy_list[user]["lat"]
-                if lat_found > -1:
-                    times.append(str(datetime.fromtimestamp(int(lat_found))))
-                flattened_buddy_list[user] = \
-                    {"times": times}
-
-        return OrderedDict(sorted(flattened_buddy_list.items()))
-
-    def parse_about_page(self, content):
+            if debug_enabled:
+                logging.debug("Got instead: {0}".format(
+                    common.prettify(decoded_json["ms"])))
+            return {}
+
+        flattened_buddy_list = [
+            (user, {"times": [_format_timestamp(infos["lat"])]
+                    if infos["lat"] > -1 else []})
+            for user, infos in buddy_list.items() if "lat" in infos]
+        flattened_buddy_list.sort(key=operator.itemgetter(0))
+
+        return dict(flattened_buddy_list)
+
+    @staticmethod
+    def parse_about_page(content):
         """Extract information from the mobile version of the about page.
 
-        Returns an OrderedDict([('name', ''), ...]).
+        Returns a dict {'name': '', ...}.
 
         Keys are added only if the fields were found in the about page.
 
@@ -206,87 +370,98 @@ class FacebookSoupParser:
         12345
         >>> FacebookSoupParser().parse_about_page('''
         ...     <input name="login" type="submit" value="Log In">''')
+        >>> FacebookSoupParser().parse_about_page("")
         """
-        soup = BeautifulSoup(content, "lxml")
-
-        user_info = OrderedDict()
+        if not content:
+            logging.error(detect_error_type(content))
+            return None
 
-        name_tag = soup.find("title")
-        if name_tag:
-            user_info["name"] = name_tag.text
+        soup = _make_soup(content)
 
-        timeline_tag = soup.find(href=re.compile(
-            r"^/.*\?v=timeline.lst=\d+%3A\d+%3A"))
+        timeline_tag = soup.find(href=_RE_TIMELINE_HREF)
         if not timeline_tag:
 
             logging.error(detect_error_type(content))
             return None
 
-        user_id = int(timeline_tag.attrs["href"].split(
-            "%3A")[1])
-        user_info["id"] = user_id
+        user_info = {}
 
-        tags = [
-            'AIM', 'Address', 'BBM', 'Birth Name', 'Birthday',
-            'Facebook', 'Foursquare', 'Gadu-Gadu', 'Gender', 'ICQ',
-            'Instagram', 'Interested in', 'Languages', 'LinkedIn',
-            'Maiden Name', 'Mobile', 'Nickname', 'Political Views',
-            'Religious views', 'Skype', 'Snapchat', 'Twitter', 'VK',
-            'Websites', 'Windows Live Messenger', 'Year of birth']
+        name_tag = soup.find("title")
+        if name_tag:
+            user_info["name"] = name_tag.text
 
-        for tag in tags:
-            found_tag = soup.find("div", attrs={"title": tag})
+        # The id sits between the first two "%3A" of the link, which the
+        # link pattern guarantees to be there
+        href = timeline_tag.attrs["href"]
+        id_start = href.find("%3A") + 3
+        user_info["id"] = int(href[id_start:href.find("%3A", id_start)])
+
+        # All the fields are in the about me section when there is one
+        about_soup = soup.find("div", class_="timeline aboutme") or soup
+
+        # Collect the candidate divs in a single pass over the section,
+        # keeping the first one found for each title / id
+        titled_divs = {}
+        identified_divs = {}
+        for div in about_soup.find_all("div"):
+            attrs = div.attrs
+            title = attrs.get("title")
+            if title is not None:
+                titled_divs.setdefault(title, div)
+            div_id = attrs.get("id")
+            if div_id in _IDENTIFIED_DIV_IDS:
+                identified_divs.setdefault(div_id, div)
+
+        for tag, key in _ABOUT_TAGS.items():
+            found_tag = titled_divs.get(tag)
             if found_tag:
-                user_info[tag.replace(" ", "_").lower()] = found_tag.text. \
-                    replace(tag, "").replace("\n", "").replace(" · Edit", "")
-
-        if "birthday" in user_info:
-            parsed_birthday = user_info["birthday"]
-            if parsed_birthday.count(" ") != 2:
+                user_info[key] = found_tag.text.replace(tag, ""). \
+                    replace("\n", "").replace(" · Edit", "")
+
+        parsed_birthday = user_info.get("birthday")
+        if parsed_birthday is not None:
+            birthday_parts = parsed_birthday.split(" ")
+            if len(birthday_parts) == 3:
+                user_info["day_and_month_of_birth"] = \
+                    birthday_parts[0] + " " + birthday_parts[1]
+                user_info["year_of_birth"] = birthday_parts[2]
+            else:
                 user_info["day_and_month_of_birth"] = parsed_birthday
                 del user_info["birthday"]
-            else:
-                user_info["day_and_month_of_birth"] = " ".join(
-                    parsed_birthday.split(" ")[0:2])
-                user_info["year_of_birth"] = parsed_birthday.split(" ")[-1]
 
-        if "year_of_birth" in user_info:
-            user_info["year_of_birth"] = int(user_info["year_of_birth"])
+        # From the birthday or from its own "Year of birth" field
+        year_of_birth = user_info.get("year_of_birth")
+        if year_of_birth is not None:
+            user_info["year_of_birth"] = int(year_of_birth)
 
-        institution_tags = ["work", "education"]
-        for institution_tag in institution_tags:
-            found_tag = soup.find("div", attrs={"id": institution_tag})
+        for institution_tag in _INSTITUTION_TAGS:
+            found_tag = identified_divs.get(institution_tag)
             if found_tag:
                 found_img_tag = found_tag.find("img")
-                if found_img_tag and "alt" in found_img_tag.attrs:
-                    user_info[institution_tag] = \
-                        found_img_tag.attrs["alt"]
+                if found_img_tag:
+                    alt = found_img_tag.get("alt")
+                    if alt is not None:
+                        user_info[institution_tag] = alt
 
-        relationship_tag = soup.find("div", attrs={"id": "relationship"})
+        relationship_tag = identified_divs.get("relationship")
         if relationship_tag:
 
-            relationship_choices = [
-                'In a relationship', 'Engaged', 'Married',
-                'In a civil partnership', 'In a domestic partnership',
-                'In an open relationship', 'It\'s complicated', 'Separated',
-                'Divorced', 'Widowed', 'Single'
-            ]
-            for relationship_choice in relationship_choices:
-                if relationship_choice in relationship_tag.text:
-                    user_info["relationship"] = relationship_choice
-                    break
+            relationship_found = _RE_RELATIONSHIP.search(
+                relationship_tag.text)
+            if relationship_found:
+                user_info["relationship"] = relationship_found.group()
 
         return user_info
 
-    def parse_friends_page(self, content):
+    @staticmethod
+    def parse_friends_page(content):
         """Extract information from the mobile version of the friends page.
 
         JavaScript has to be disabled when fetching the page, otherwise, the
         content returned by requests does not contain the UIDs.
 
         Returns a GenericResult(
-            content=OrderedDict([('friends',
-                OrderedDict([('/link1', 'Friend 1'), ...]),
+            content={'friends': {'/link1': 'Friend 1', ...}},
                 see_more_links=[])
 
         >>> FacebookSoupParser().parse_friends_page('''
@@ -304,9 +479,9 @@ class FacebookSoupParser:
         ...             </a>
         ...         </div>
         ...     </div>''')
-        GenericResult(content=OrderedDict([('friends', OrderedDict([\
-('username1?fref=fr_tab&foo', 'Mark'), \
-('profile.php?id=1111&fref=fr_tab', 'Dave')]))]), \
+        GenericResult(content={'friends': {\
+'username1?fref=fr_tab&foo': 'Mark', \
+'profile.php?id=1111&fref=fr_tab': 'Dave'}}, \
 see_more_links=['/seeMoreLink'])
 
         >>> FacebookSoupParser().parse_friends_page('''
@@ -315,13 +490,13 @@ see_more_links=['/seeMoreLink'])
         ...         <a href="/friends/center/friends/?ppk=1&amp;
         ...             tid=u_0_0&amp;bph=1#friends_center_main">
         ...     </div>''')
-        GenericResult(content=OrderedDict([('friends', OrderedDict())]), \
+        GenericResult(content={'friends': {}}, \
 see_more_links=[])
 
         >>> FacebookSoupParser().parse_friends_page('''
         ...     <div id="objects_container">
         ...     </div>''')
-        GenericResult(content=OrderedDict([('friends', OrderedDict())]), \
+        GenericResult(content={'friends': {}}, \
 see_more_links=[])
 
         >>> FacebookSoupParser().parse_friends_page("")
@@ -330,7 +505,13 @@ see_more_links=[])
         ...     <input name="login" type="submit" value="Log In">''')
         """
 
-        soup = BeautifulSoup(content, "lxml")
+        # Pages without the container are error pages, no need to build
+        # a tree to find that out
+        if not _contains(content, ["objects_container"]):
+            logging.error(detect_error_type(content))
+            return None
+
+        soup = _make_soup(content, _OBJECTS_STRAINER)
 
         main_soup = soup.find(id="objects_container")
         if not main_soup:
@@ -338,15 +519,14 @@ see_more_links=[])
             logging.error(detect_error_type(content))
             return None
 
-        friends_found = OrderedDict()
+        friends_found = {}
         links_soup = main_soup.find_all(
-            "a",
-            attrs={"href": re.compile(r"^/.*fref=fr_tab")})
+            "a", attrs={"href": _RE_FRIEND_HREF})
         for link in links_soup:
             friends_found[link.attrs["href"][1:]] = \
                 link.text
 
-        result = OrderedDict()
+        result = {}
         result["friends"] = friends_found
 
         see_more_links = []
@@ -359,12 +539,13 @@ see_more_links=[])
         return GenericResult(
             content=result, see_more_links=see_more_links)
 
-    def parse_likes_page(self, content):
+    @staticmethod
+    def parse_likes_page(content):
         """Extract information from the page showing the likes of a user.
 
         Returns a GenericResult, containing:
-        - content: an OrderedDict mapping categories to likes, e.g.:
-        ([('category1', OrderedDict([('link1', 'likeName1'), ...]), ...])
+        - content: a dict mapping categories to likes, e.g.:
+        {'category1': {'link1': 'likeName1', ...}, ...}
         - see_more_links: all the links that were found on the page to explore.
 
         >>> FacebookSoupParser().parse_likes_page('''
@@ -420,13 +601,13 @@ see_more_links=[])
         ...             </div>
         ...         </div>
         ...     </div>''')
-        GenericResult(content=OrderedDict([\
-('Music', OrderedDict([('cat1Link1', 'Item 1-1')])), \
-('Restaurants', OrderedDict([('cat2Link1', 'Item 2-1')])), \
-('TV Programmes', OrderedDict([('cat3Link1', 'Item 3-1'), \
-('cat3Link2', 'Item 3-2')])), \
-('Other', OrderedDict([('cat4Link1', 'Item 4-1'), \
-('cat4Link2', 'Item 4-2')]))]), \
+        GenericResult(content={\
+'Music': {'cat1Link1': 'Item 1-1'}, \
+'Restaurants': {'cat2Link1': 'Item 2-1'}, \
+'TV Programmes': {'cat3Link1': 'Item 3-1', \
+'cat3Link2': 'Item 3-2'}, \
+'Other': {'cat4Link1': 'Item 4-1', \
+'cat4Link2': 'Item 4-2'}}, \
 see_more_links=['/cat1SeeMoreLink', '/cat3SeeMoreLink', '/cat4SeeMoreLink'])
 
         >>> FacebookSoupParser().parse_likes_page('''
@@ -446,15 +627,15 @@ see_more_links=['/cat1SeeMoreLink', '/cat3SeeMoreLink', '/cat4SeeMoreLink'])
         ...         </div>
         ...         </div>
         ...     </div>''')
-        GenericResult(content=OrderedDict([\
-('Films', OrderedDict([('cat1Link1', 'Item 1-1'), \
-('cat1Link2', 'Item 1-2')]))]), \
+        GenericResult(content={\
+'Films': {'cat1Link1': 'Item 1-1', \
+'cat1Link2': 'Item 1-2'}}, \
 see_more_links=[])
 
         >>> FacebookSoupParser().parse_likes_page('''
         ...     <div id="objects_container">
         ...     </div>''')
-        GenericResult(content=OrderedDict(), see_more_links=[])
+        GenericResult(content={}, see_more_links=[])
 
         >>> FacebookSoupParser().parse_likes_page("")
 
@@ -462,7 +643,11 @@ see_more_links=[])
         ...     <input name="login" type="submit" value="Log In">''')
         """
 
-        soup = BeautifulSoup(content, "lxml")
+        if not _contains(content, ["objects_container"]):
+            logging.error(detect_error_type(content))
+            return None
+
+        soup = _make_soup(content, _OBJECTS_STRAINER)
 
         main_soup = soup.find(id="objects_container")
         if not main_soup:
@@ -471,20 +656,20 @@ see_more_links=[])
             return None
 
         see_more_links = []
-        result = OrderedDict()
+        result = {}
 
         main_category = None
         main_category_soup = main_soup.find("h2")
         if main_category_soup:
             main_category = main_category_soup.text
 
-        category_soup = main_soup.find_all(re.compile("^h[34]$"))
+        category_soup = main_soup.find_all(_RE_LIKES_CATEGORY)
         for category in category_soup:
             category_name = category.text.strip()
             if main_category:  # e.g. for Films, category_name is Likes
                 category_name = main_category
 
-            result[category_name] = OrderedDict()
+            category_likes = result[category_name] = {}
 
             parent_tag = None
             if category.name == "h4":
@@ -493,21 +678,23 @@ see_more_links=[])
                 parent_tag = category.parent.parent
 
             link_soup = parent_tag.find_all(
-                "a", attrs={"href": re.compile(r"^/.*")})
+                "a", attrs={"href": _RE_HREF_SLASH})
             for link in link_soup:
-                if link.text.strip() == "See more":
+                link_text = link.text
+                stripped_text = link_text.strip()
+                if stripped_text == "See more":
                     see_more_links.append(link.attrs["href"])
-                elif link.text != "Like":
-                    result[category_name][link.attrs["href"][1:]] = \
-                        link.text.strip()
+                elif link_text != "Like":
+                    category_likes[link.attrs["href"][1:]] = stripped_text
 
         return GenericResult(
             content=result, see_more_links=see_more_links)
 
-    def parse_mutual_friends_page(self, content):
+    @staticmethod
+    def parse_mutual_friends_page(content):
         """Extract information from a mutual friends page.
 
-        Returns an OrderedDict([('username1', {'name': 'name1'}), ...]) mapping
+        Returns a dict {'username1': {'name': 'name1'}, ...} mapping
         usernames to names.
 
         >>> FacebookSoupParser().parse_mutual_friends_page('''
@@ -521,9 +708,9 @@ see_more_links=[])
         ...                 <span>195 more mutual friends</span>
         ...             </a></div>
         ...     </div>''')
-        GenericResult(content=OrderedDict([('mutual_friends', OrderedDict([\
-('username.1?fref=fr_tab', 'Name 1'), \
-('username.2?fref=fr_tab&refid=17', 'Name 2')]))]), \
+        GenericResult(content={'mutual_friends': {\
+'username.1?fref=fr_tab': 'Name 1', \
+'username.2?fref=fr_tab&refid=17': 'Name 2'}}, \
 see_more_links=['/seeMoreLink'])
 
         >>> FacebookSoupParser().parse_mutual_friends_page('''
@@ -532,14 +719,14 @@ see_more_links=['/seeMoreLink'])
         ...         <a href="/friends/center/friends/?ppk=1&amp;
         ...             tid=u_0_0&amp;bph=1#friends_center_main">
         ...     </div>''')
-        GenericResult(content=OrderedDict([('mutual_friends', \
-OrderedDict())]), see_more_links=[])
+        GenericResult(content={'mutual_friends': {}}, \
+see_more_links=[])
 
         >>> FacebookSoupParser().parse_mutual_friends_page('''
         ...     <div id="objects_container">
         ...     </div>''')
-        GenericResult(content=OrderedDict([('mutual_friends', \
-OrderedDict())]), see_more_links=[])
+        GenericResult(content={'mutual_friends': {}}, \
+see_more_links=[])
 
         >>> FacebookSoupParser().parse_mutual_friends_page("")
 
@@ -547,7 +734,11 @@ OrderedDict())]), see_more_links=[])
         ...     <input name="login" type="submit" value="Log In">''')
         """
 
-        soup = BeautifulSoup(content, "lxml")
+        if not _contains(content, ["objects_container"]):
+            logging.error(detect_error_type(content))
+            return None
+
+        soup = _make_soup(content, _OBJECTS_STRAINER)
 
         main_soup = soup.find(id="objects_container")
         if not main_soup:
@@ -555,13 +746,13 @@ OrderedDict())]), see_more_links=[])
             logging.error(detect_error_type(content))
             return None
 
-        mutual_friends_found = OrderedDict()
+        mutual_friends_found = {}
         links_soup = main_soup.find_all(
-            "a", attrs={"href": re.compile(r"^/.*\?fref=fr_tab")})
+            "a", attrs={"href": _RE_MUTUAL_FRIEND_HREF})
         for link in links_soup:
             mutual_friends_found[link.attrs["href"][1:]] = link.text
 
-        result = OrderedDict()
+        result = {}
         result["mutual_friends"] = mutual_friends_found
 
         see_more_links = []
@@ -574,7 +765,8 @@ OrderedDict())]), see_more_links=[])
         return GenericResult(
             content=result, see_more_links=see_more_links)
 
-    def parse_timeline_years_links(self, content):
+    @staticmethod
+    def parse_timeline_years_links(content):
         """
         >>> FacebookSoupParser().parse_timeline_years_links('''
         ...     <div id="tlFeed">
@@ -608,14 +800,19 @@ OrderedDict())]), see_more_links=[])
         >>> FacebookSoupParser().parse_timeline_years_links('''
         ...     <input name="login" type="submit" value="Log In">''')
         []
+        >>> FacebookSoupParser().parse_timeline_years_links("")
+        []
         """
 
-        soup = BeautifulSoup(content, "lxml")
-
         links_found = []
 
-        main_soup = soup.find(
-            id=["tlFeed", "timelineBody", "m_group_stories_container"])
+        if not _contains(content, _YEARS_CONTAINER_IDS):
+            logging.error(detect_error_type(content))
+            return links_found
+
+        soup = _make_soup(content, _TIMELINE_STRAINER)
+
+        main_soup = soup.find(id=_YEARS_CONTAINER_IDS)
         if not main_soup:
 
             logging.error(detect_error_type(content))
@@ -623,14 +820,20 @@ OrderedDict())]), see_more_links=[])
 
         links_soup = main_soup.find_all('a')
         for link in links_soup:
-            if "href" in link.attrs:
-                year_found = re.match(r'^\d{4}$', link.text)
-                if year_found:
-                    links_found.append(link.attrs["href"])
+            href = link.get("href")
+            if href is not None:
+                # Same as matching r"^\d{4}$", whose $ also allows one
+                # trailing newline
+                year = link.text
+                if year[-1:] == "\n":
+                    year = year[:-1]
+                if len(year) == 4 and year.isdecimal():
+                    links_found.append(href)
 
         return links_found
 
-    def parse_post(self, soup):
+    @staticmethod
+    def parse_post(soup):
         """
         >>> FacebookSoupParser().parse_post(BeautifulSoup('''
         ...   <article>
@@ -665,15 +868,15 @@ Love" href="/link1">10</a>
         ...       <a href="https://m.facebook.com/fu">Full Story</a>
         ...     </div>
         ...   </article>''', 'lxml'))
-        OrderedDict([('post_id', 151), \
-('content', 'User 1 Some text User 2 User 2 again! \
-User 3 - Some more Location.'), \
-('participants', ['username1', 'username2', 'profile.php?id=3333', \
-'4444', '5555']), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 10), \
-('comment_count', 12), \
-('story_link', 'https://m.facebook.com/fu')])
+        {'post_id': 151, \
+'content': 'User 1 Some text User 2 User 2 again! \
+User 3 - Some more Location.', \
+'participants': ['username1', 'username2', 'profile.php?id=3333', \
+'4444', '5555'], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 10, \
+'comment_count': 12, \
+'story_link': 'https://m.facebook.com/fu'}
 
         >>> FacebookSoupParser().parse_post(BeautifulSoup('''
         ...     <article>
@@ -690,11 +893,11 @@ Like, Love and Wow" href="/link1">114,721</a>
         ...             <a href="/link3">2,746 Comments</a>
         ...         </div>
         ...     </article>''', 'lxml'))
-        OrderedDict([('post_id', 151), ('content', 'Some text'), \
-('participants', []), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 114721), \
-('comment_count', 2746), ('story_link', '')])
+        {'post_id': 151, 'content': 'Some text', \
+'participants': [], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 114721, \
+'comment_count': 2746, 'story_link': ''}
 
         >>> FacebookSoupParser().parse_post(BeautifulSoup('''
         ...     <article>
@@ -710,11 +913,11 @@ Like, Love and Wow" href="/link1">114,721</a>
         ...             <a href="/link3">Comment</a>
         ...         </div>
         ...     </article>''', 'lxml'))
-        OrderedDict([('post_id', 152), ('content', 'Some text'), \
-('participants', []), \
-('date', '2008-05-14 10:02:00'), \
-('date_org', '14 May 2008 at 10:02'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')])
+        {'post_id': 152, 'content': 'Some text', \
+'participants': [], \
+'date': '2008-05-14 10:02:00', \
+'date_org': '14 May 2008 at 10:02', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}
 
         >>> FacebookSoupParser().parse_post(BeautifulSoup('''
         ...     <article>
@@ -733,65 +936,92 @@ Like, Love and Wow" href="/link1">114,721</a>
             soup = soup.article
 
         participants_found = []
+        # Same ids as participants_found, for constant time lookups
+        participants_seen = set()
         content = []
         if not soup:
             return None
         for child in soup.children:
-            if hasattr(child, 'attrs'):
-                if "data-ft" in child.attrs:
+            attrs = getattr(child, "attrs", None)
+            if attrs is not None:
+                if "data-ft" in attrs:
                     break
-                link_soup = child.find_all(href=re.compile("^/.*"))
-                for link in link_soup:
-                    link_found = link.attrs["href"][1:]
+                # Gather the participants and the text of the child in a
+                # single walk of its subtree
+                sub_content = []
+                for node in child.descendants:
+                    if type(node) in _TEXT_STRING_TYPES:
+                        stripped_node = node.strip()
+                        if stripped_node:
+                            sub_content.append(stripped_node)
+                        continue
+                    if not isinstance(node, Tag):
+                        continue
+                    href = node.get("href")
+                    if href is None or not href.startswith("/"):
+                        continue
+
+                    link_found = href[1:]
                     if "/profile.php" in link_found:
                         link_found = link_found.split("/profile.php?id=")[1]
                         ids = link_found.split("&")[0]
                         participants_found.append(ids)
+                        participants_seen.add(ids)
                     else:
-                        id_found = link_found.split("&refid=18")[0]
-                        id_found = id_found.split("?refid=18")[0]
-                        id_found = id_found.split("?lst")[0]
-                        id_found = id_found.split("&fref")[0]
-                        id_found = id_found.split("&lst")[0]
+                        id_found = _RE_ID_TRIM.split(link_found, 1)[0]
                         if id_found != link_found and \
-                            id_found not in participants_found and \
+                            id_found not in participants_seen and \
                             '/photos/' not in id_found and \
                             'story.php?' not in id_found:
                             participants_found.append(id_found)
+                            participants_seen.add(id_found)
 
-                sub_content = []
-                for s in child.strings:
-                    stripped_s = s.strip()
-                    if stripped_s:
-                        sub_content.append(stripped_s)
                 content.append(" ".join(sub_content))
         content_string = " - ".join(content)
         content_string = content_string.replace(" .", ".")
 
-        date_tag = soup.find("abbr")
+        # Look up the date, the likes span and the header in a single walk
+        # of the article instead of one find() per tag
+        date_tag = span_tag = h3_element = None
+        for tag in soup.descendants:
+            name = tag.name
+            if name is None:
+                continue
+            if name == "abbr":
+                if date_tag is None:
+                    date_tag = tag
+            elif name == "h3":
+                if h3_element is None:
+                    h3_element = tag
+            if span_tag is None:
+                tag_id = tag.get("id")
+                if tag_id and _RE_LIKE_ID.search(tag_id):
+                    span_tag = tag
+            if date_tag is not None and span_tag is not None and \
+                    h3_element is not None:
+                break
+
         if not date_tag:
             logging.info("Skipping original article shared.")
             return None
         date_org = date_tag.text
         date = str(model.parse_date(date_org))
 
-        span_tag = soup.find(id=re.compile(r"like_\d+"))
         if not span_tag:
             logging.info("Skipping article - no link for likes found.")
             return None
-        article_id = int(re.findall(r'\d+', span_tag.attrs["id"])[0])
-        h3_element = soup.find('h3')
+        article_id = int(_RE_LIKE_ID.search(span_tag.attrs["id"]).group(1))
         withs = []
         location = {}
         with_exist = False
         location_exist = False
         for child in h3_element.children:
-            if child.name == "span": # no additional info
+            name = child.name
+            if name == "span":  # no additional info
                 break
-            
-                
+
             if with_exist == True:
-                if child.name == "a":
+                if name == "a":
                     with_element = child
                 else:
                     with_element = child.find('a')
@@ -800,45 +1030,64 @@ Like, Love and Wow" href="/link1">114,721</a>
                 withs.append({'name': with_name, 'url': with_url})
                 with_exist = False
             if location_exist == True:
-                location['name'] = child.find('a').text
-                location['url'] = child.find('a').attrs['href'].split('&')[0]
+                location_element = child.find('a')
+                location['name'] = location_element.text
+                location['url'] = location_element.attrs['href'].split('&')[0]
                 location_exist = False
             if isinstance(child, NavigableString):
                 text = child
             else:
                 text = child.text
-            if "with" in (text.strip().lower().split(" ")) or ("and" in text.strip().lower().split(" ")):
+            words = set(text.strip().lower().split(" "))
+            if "with" in words or "and" in words:
                 with_exist = True
-            if "at" in text.strip().lower().split(" "):
+            if "at" in words:
                 location_exist = True
 
 
         like_count = 0
         reaction_link = span_tag.find(
-            'a', attrs={"aria-label": re.compile(r"reaction")})
+            'a', attrs={"aria-label": _RE_REACTION})
         if reaction_link:
             like_count = int(reaction_link.text.replace(",", ""))
 
+        # Find the comments and full story links in a single lazy walk of
+        # the article, stopping once both are found. Anchors are matched
+        # on their string like find(string=...) does
+        comment_link = full_story_soup = None
+        for link in soup.descendants:
+            if link.name != "a":
+                continue
+            link_string = link.string
+            if link_string is None:
+                continue
+            if comment_link is None and \
+                    _RE_COMMENT_COUNT.search(link_string):
+                comment_link = link
+            if full_story_soup is None and link_string == "Full Story":
+                full_story_soup = link
+            if comment_link is not None and full_story_soup is not None:
+                break
+
         comment_count = 0
-        comment_link = soup.find("a", string=re.compile(r"\d+ Comment"))
         if comment_link:
             comment_count = int(
                 comment_link.text.split(" Comment")[0].replace(",", ""))
 
         full_story_link = ""
-        full_story_soup = soup.find("a", string="Full Story")
-        if full_story_soup and "href" in full_story_soup.attrs:
-            full_story_link = full_story_soup.attrs["href"]
-
-        return OrderedDict([
-            ("post_id", article_id), ("content", content_string),
-            ("location", location),
-            ("participants", participants_found),
-            ("date", date), ("date_org", date_org),
-            ("like_count", like_count), ("comment_count", comment_count),
-            ("story_link", full_story_link)])
-
-    def parse_timeline_page(self, content):
+        if full_story_soup:
+            full_story_link = full_story_soup.get("href", "")
+
+        return {
+            "post_id": article_id, "content": content_string,
+            "location": location,
+            "participants": participants_found,
+            "date": date, "date_org": date_org,
+            "like_count": like_count, "comment_count": comment_count,
+            "story_link": full_story_link}
+
+    @staticmethod
+    def parse_timeline_page(content):
         """
         >>> FacebookSoupParser().parse_timeline_page('''
         ...     <div id="tlFeed">
@@ -858,17 +1107,17 @@ Like, Love and Wow" href="/link1">114,721</a>
         ...             <a href="/show_more_link">Show more</a>
         ...         </div>
         ...     </div>''')
-        TimelineResult(articles=OrderedDict([\
-(151, OrderedDict([('post_id', 151), ('content', ''), \
-('participants', []), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')])), \
-(152, OrderedDict([('post_id', 152), ('content', ''), \
-('participants', []), \
-('date', '2008-05-13 10:25:00'), \
-('date_org', '13 May 2008 at 10:25'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')]))]), \
+        TimelineResult(articles={\
+151: {'post_id': 151, 'content': '', \
+'participants': [], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}, \
+152: {'post_id': 152, 'content': '', \
+'participants': [], \
+'date': '2008-05-13 10:25:00', \
+'date_org': '13 May 2008 at 10:25', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}}, \
 show_more_link='/show_more_link')
         >>> FacebookSoupParser().parse_timeline_page('''
         ...     <div id="timelineBody">
@@ -881,12 +1130,12 @@ show_more_link='/show_more_link')
         ...             </div>
         ...         </article>
         ...     </div>''')
-        TimelineResult(articles=OrderedDict([\
-(151, OrderedDict([('post_id', 151), ('content', ''), \
-('participants', []), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')]))]), show_more_link='')
+        TimelineResult(articles={\
+151: {'post_id': 151, 'content': '', \
+'participants': [], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}}, show_more_link='')
         >>> FacebookSoupParser().parse_timeline_page('''
         ...     <div id="m_group_stories_container">
         ...         <article>
@@ -896,12 +1145,12 @@ show_more_link='/show_more_link')
         ...             </div>
         ...         </article>
         ...     </div>''')
-        TimelineResult(articles=OrderedDict([\
-(151, OrderedDict([('post_id', 151), ('content', ''), \
-('participants', []), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')]))]), show_more_link='')
+        TimelineResult(articles={\
+151: {'post_id': 151, 'content': '', \
+'participants': [], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}}, show_more_link='')
         >>> FacebookSoupParser().parse_timeline_page('''
         ...     <div id="structured_composer_async_container">
         ...         <article>
@@ -911,30 +1160,49 @@ show_more_link='/show_more_link')
         ...             </div>
         ...         </article>
         ...     </div>''')
-        TimelineResult(articles=OrderedDict([\
-(151, OrderedDict([('post_id', 151), ('content', ''), \
-('participants', []), \
-('date', '2008-05-13 10:02:00'), \
-('date_org', '13 May 2008 at 10:02'), ('like_count', 0), \
-('comment_count', 0), ('story_link', '')]))]), show_more_link='')
+        TimelineResult(articles={\
+151: {'post_id': 151, 'content': '', \
+'participants': [], \
+'date': '2008-05-13 10:02:00', \
+'date_org': '13 May 2008 at 10:02', 'like_count': 0, \
+'comment_count': 0, 'story_link': ''}}, show_more_link='')
         >>> FacebookSoupParser().parse_timeline_page('''
         ...     <input name="login" type="submit" value="Log In">''')
+        >>> FacebookSoupParser().parse_timeline_page('''
+        ...     <div id="tlFeed">
+        ...         <a href="/see_more_posts_link">See more posts</a>
+        ...     </div>''')
+        TimelineResult(articles={}, show_more_link='/see_more_posts_link')
+        >>> FacebookSoupParser().parse_timeline_page('''
+        ...     <div id="structured_composer_async_container"></div>
+        ...     <div id="timelineBody">
+        ...         <a href="/show_more_link">Show more</a>
+        ...     </div>''')
+        TimelineResult(articles={}, show_more_link='/show_more_link')
+        >>> FacebookSoupParser().parse_timeline_page('''
+        ...     <div id="tlFeed"></div>
+        ...     <div>
+        ...         <a href="/outside_link">Show more</a>
+        ...     </div>''')
+        TimelineResult(articles={}, show_more_link='/outside_link')
+        >>> FacebookSoupParser().parse_timeline_page("")
         """
-        soup = BeautifulSoup(content, "lxml")
+        if not _contains(content, _TIMELINE_CONTAINER_IDS):
+            logging.error(detect_error_type(content))
+            return None
+
+        soup = _make_soup(content, _TIMELINE_STRAINER)
 
-        main_soup = soup.find(
-            id=[
-                "tlFeed", "timelineBody", "m_group_stories_container",
-                "structured_composer_async_container"])
+        main_soup = soup.find(id=_TIMELINE_CONTAINER_IDS)
         if not main_soup:
 
             logging.error(detect_error_type(content))
             return None
 
-        articles_found = OrderedDict()
+        articles_found = {}
         articles_soup = main_soup.find_all("article")
         for article in articles_soup:
-            post = self.parse_post(article)
+            post = FacebookSoupParser.parse_post(article)
             if post:
                 logging.info(
                     "Found post: {0}".format(post))
@@ -943,16 +1211,40 @@ show_more_link='/show_more_link')
                 # only the date will change.
                 articles_found[post["post_id"]] = post
 
-        show_more_link_tag = soup.find(
-            "a", string=["Show more", "See more posts"])
+        # Look for the link in the feed container first, then in all the
+        # containers kept in the soup, e.g. when the composer comes first,
+        # and finally among all the links of the page. Pages without any
+        # such text need no lookup at all.
         link_found = ""
-        if show_more_link_tag and "href" in show_more_link_tag.attrs:
-            link_found = show_more_link_tag.attrs["href"]
+        if _contains(content, _SHOW_MORE_TEXTS):
+            show_more_link_tag = \
+                main_soup.find("a", string=_SHOW_MORE_TEXTS) or \
+                soup.find("a", string=_SHOW_MORE_TEXTS) or \
+                _make_soup(content, _LINKS_STRAINER).find(
+                    "a", string=_SHOW_MORE_TEXTS)
+            if show_more_link_tag:
+                link_found = show_more_link_tag.get("href", "")
 
         return TimelineResult(
             articles=articles_found, show_more_link=link_found)
 
-    def parse_reaction_page(self, content):
+    @classmethod
+    def parse_timeline_pages(cls, contents, workers=None):
+        """Parse several timeline pages in parallel, see parse_many.
+
+        Even the few pages fetched for a timeline are split over the
+        workers, as parse_many sizes its chunks from the batch.
+
+        >>> FacebookSoupParser().parse_timeline_pages([
+        ...     '<div id="tlFeed"><a href="/link1">Show more</a></div>',
+        ...     '<div id="tlFeed"></div>'])
+        [TimelineResult(articles={}, show_more_link='/link1'), \
+TimelineResult(articles={}, show_more_link='')]
+        """
+        return cls.parse_many("parse_timeline_page", contents, workers)
+
+    @staticmethod
+    def parse_reaction_page(content):
         """
         >>> FacebookSoupParser().parse_reaction_page('''
         ...     <div id="objects_container">
@@ -977,9 +1269,14 @@ see_more_link='/ufi/reaction/link')
         ReactionResult(likers=[], see_more_link=None)
         >>> FacebookSoupParser().parse_reaction_page('''
         ...     <input name="login" type="submit" value="Log In">''')
+        >>> FacebookSoupParser().parse_reaction_page("")
         """
 
-        soup = BeautifulSoup(content, "lxml")
+        if not _contains(content, ["objects_container"]):
+            logging.error(detect_error_type(content))
+            return None
+
+        soup = _make_soup(content, _OBJECTS_STRAINER)
 
         usernames_found = []
 
@@ -989,27 +1286,21 @@ see_more_link='/ufi/reaction/link')
             logging.error(detect_error_type(content))
             return None
 
-        links_soup = main_soup.find_all(href=re.compile("^/.*"))
-        invalid_links = ["add_friend.php", "ufi/reaction", "home.php?"]
+        links_soup = main_soup.find_all(href=_RE_HREF_SLASH)
         for link in links_soup:
-            if "role" not in link.attrs and \
-               "href" in link.attrs:
+            # Links were selected on their href, only role can be missing
+            if "role" not in link.attrs:
 
                 username = link.attrs["href"][1:]
 
-                is_invalid = False
-                for invalid_link in invalid_links:
-                    if invalid_link in username:
-                        is_invalid = True
-                        break
-
-                if username and not is_invalid:
+                if username and \
+                   not _RE_INVALID_REACTION_LINK.search(username):
                     usernames_found.append(username)
 
         see_more_link_tag = main_soup.find("a", string="See more")
         link_found = None
-        if see_more_link_tag and "href" in see_more_link_tag.attrs:
-            link_found = see_more_link_tag.attrs["href"]
+        if see_more_link_tag:
+            link_found = see_more_link_tag.get("href")
 
         return ReactionResult(
             likers=usernames_found, see_more_link=link_found)
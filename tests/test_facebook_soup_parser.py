@@ -0,0 +1,29 @@
+from core.facebook_soup_parser import FacebookSoupParser, TimelineResult
+
+from nose.tools import assert_equal, assert_greater
+import os
+import time
+
+
+class PidRecordingParser(FacebookSoupParser):
+
+    @staticmethod
+    def parse_timeline_page(content):
+        # Long enough for the other workers to pick up pages meanwhile
+        time.sleep(0.1)
+        return os.getpid(), FacebookSoupParser.parse_timeline_page(content)
+
+
+def test_parse_timeline_pages_uses_several_workers():
+    # The fetcher reads at most 6 timeline pages per user
+    contents = [
+        '<div id="tlFeed"><a href="/link{0}">Show more</a></div>'.format(i)
+        for i in range(6)]
+
+    results = PidRecordingParser.parse_timeline_pages(contents, workers=2)
+
+    assert_equal(
+        [result for _, result in results],
+        [TimelineResult(articles={}, show_more_link="/link{0}".format(i))
+         for i in range(6)])
+    assert_greater(len({pid for pid, _ in results}), 1)